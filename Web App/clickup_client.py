@@ -1,7 +1,26 @@
+import hashlib
 import logging
-import requests
+import ijson
+import orjson
+import requests_cache
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Max entries ClickUp returns per page of /time_entries
+TIME_ENTRIES_PAGE_SIZE = 100
+# Upper bound on pages fetched for one time entries query
+TIME_ENTRIES_MAX_PAGES = 100
+
+# Columns returned by ClickUpClient.fetch_time_entry_columns
+TIME_ENTRY_COLUMNS = ('id', 'start', 'end', 'duration', 'billable', 'username', 'tags')
+
+def _decode(response):
+    """Decode a JSON response body with orjson (faster than response.json())."""
+    return orjson.loads(response.content)
 
 class ClickUpClient:
     """A read-only client for the ClickUp API."""
@@ -21,19 +40,133 @@ class ClickUpClient:
             'Content-Type': 'application/json'
         }
 
+        # Pooled session so repeated calls to api.clickup.com reuse one
+        # TCP/TLS connection instead of opening a new one per request.
+        # GET responses are cached on disk (one cache file per token so users
+        # never see each other's data); metadata changes rarely, time entries often
+        token_hash = hashlib.sha256(self.api_token.encode()).hexdigest()[:16]
+        self.session = requests_cache.CachedSession(
+            cache_name=f'clickup_{token_hash}',
+            backend='sqlite',
+            expire_after=300,
+            allowable_methods=['GET'],
+            urls_expire_after={
+                '*/time_entries*': 30,
+                '*/task/*/time': 30,
+                '*/space/*': 3600,
+                '*/folder/*': 3600,
+            },
+        )
+        self.session.headers.update(self.headers)
+        # Rate limits (429) and transient errors back off exponentially,
+        # honouring ClickUp's Retry-After header, for every request
+        retry = Retry(
+            total=6,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            allowed_methods=['GET'],
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Uncached session for streamed responses: requests-cache reads the
+        # whole body to store it, which consumes response.raw before ijson can
+        self.stream_session = Session()
+        self.stream_session.headers.update(self.headers)
+        self.stream_session.mount('https://', adapter)
+        self.stream_session.mount('http://', adapter)
+
+        # list_id -> 'DoNotAlter' view, filled by get_table_view
+        self._table_view_cache = {}
+
+    def close(self):
+        """Close the underlying HTTP sessions and their pooled connections."""
+        self.session.close()
+        self.stream_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     # um, should actually not be a class function, but we'll fix that later
-    def fetch_clickup_data(self, start_date, end_date, team_id, assignees):
-        """Fetch data from the ClickUp API for a given date range, team, and assignees."""
+    def fetch_clickup_data(self, start_date, end_date, team_id, assignees, batch_size: int = 4):
+        """Fetch data from the ClickUp API for a given date range, team, and assignees.
+
+        The first page is probed on its own; if it is full, following pages
+        are requested ``batch_size`` at a time in parallel until a short page
+        marks the end.
+        """
+        params = {'start_date': start_date, 'end_date': end_date, 'assignee': assignees}
 
-        url = f"https://api.clickup.com/api/v2/team/{team_id}/time_entries?start_date={start_date}&end_date={end_date}&assignee={assignees}"
-        headers = {"Authorization": self.api_token}
-        response = requests.get(url, headers=headers)
+        def fetch_page(page):
+            return self._get(f'team/{team_id}/time_entries', params={**params, 'page': page}).get('data', [])
 
-        if response.status_code == 200:
-            return response.json().get("data", [])
-        else:
-            print(f"API Error: {response.status_code}")
-            return []
+        return self._fetch_pages(fetch_page, batch_size)
+
+    def fetch_time_entry_columns(self, start_date, end_date, team_id, assignees, batch_size: int = 4):
+        """Fetch time entries as column lists, streaming each page instead of loading it whole.
+
+        Each response body is parsed incrementally with ijson and only the
+        fields needed for reporting are kept, so the full entry dictionaries
+        never accumulate in memory. Pages are fetched like fetch_clickup_data.
+
+        Returns:
+            dict: {column: list} for each name in TIME_ENTRY_COLUMNS; ``tags``
+            holds a list of tag names per entry.
+        """
+        params = {'start_date': start_date, 'end_date': end_date, 'assignee': assignees}
+
+        def fetch_page(page):
+            return [
+                (
+                    entry.get('id'),
+                    entry.get('start'),
+                    entry.get('end'),
+                    entry.get('duration'),
+                    bool(entry.get('billable')),
+                    (entry.get('user') or {}).get('username'),
+                    [tag['name'] for tag in entry.get('tags') or []],
+                )
+                for entry in self._stream_items(f'team/{team_id}/time_entries', 'data.item', params={**params, 'page': page})
+            ]
+
+        rows = self._fetch_pages(fetch_page, batch_size)
+        if not rows:
+            return {name: [] for name in TIME_ENTRY_COLUMNS}
+        return {name: list(column) for name, column in zip(TIME_ENTRY_COLUMNS, zip(*rows))}
+
+    def _fetch_pages(self, fetch_page, batch_size: int) -> list:
+        """Concatenate time entry pages in order.
+
+        Page 0 is probed on its own; if it is full, following pages are
+        requested ``batch_size`` at a time in parallel until a short page
+        marks the end. Paging also stops if a page repeats page 0 (the
+        endpoint ignored ``page``) or after TIME_ENTRIES_MAX_PAGES pages.
+        """
+        first = fetch_page(0)
+        if len(first) != TIME_ENTRIES_PAGE_SIZE:
+            return first  # Short page, or an unpaged response holding everything
+
+        entries = list(first)
+        page = 1
+        with ThreadPoolExecutor(max_workers=batch_size) as executor:
+            while page < TIME_ENTRIES_MAX_PAGES:
+                pages = range(page, min(page + batch_size, TIME_ENTRIES_MAX_PAGES))
+                for data in executor.map(fetch_page, pages):
+                    if data and data[0] == first[0]:
+                        logging.warning("Time entries endpoint ignored the page parameter; returning page 0 only")
+                        return entries
+                    entries.extend(data)
+                    if len(data) != TIME_ENTRIES_PAGE_SIZE:
+                        return entries  # Last page reached
+                page += batch_size
+
+        logging.warning(f"Stopped paging time entries after {TIME_ENTRIES_MAX_PAGES} pages")
+        return entries
 
     def get_space_tags(self, space_id):
         """
@@ -43,18 +176,7 @@ class ClickUpClient:
         Returns:
             list: A list of tag dictionaries, or an empty list if none found.
         """
-        url = f"{self.base_url}/space/{space_id}/tag"
-        headers = {
-            "Authorization": self.api_token
-        }
-
-        response = requests.get(url, headers=headers)
-
-        if response.status_code == 200:
-            return response.json().get("tags", [])
-        else:
-            print(f"Failed to fetch tags. Status code: {response.status_code}")
-            return []
+        return self._get(f'space/{space_id}/tag').get('tags', [])
 
     def _get(self, endpoint: str, params: dict | None = None) -> dict:
         """Make a GET request to the ClickUp API.
@@ -66,13 +188,25 @@ class ClickUpClient:
         Returns:
             dict: JSON response from the API
         """
-        response = requests.get(
+        response = self.session.get(
             f"{self.base_url}{endpoint}",
-            headers=self.headers,
             params=params
         )
         response.raise_for_status()
-        return response.json()
+        return _decode(response)
+
+    def _stream_items(self, endpoint: str, prefix: str, params: dict | None = None):
+        """Stream a GET response and yield the JSON items under ``prefix`` as they are parsed.
+
+        Args:
+            endpoint (str): API endpoint to call
+            prefix (str): ijson prefix of the items to yield, e.g. 'data.item'
+            params (dict, optional): Query parameters for the request
+        """
+        with self.stream_session.get(f"{self.base_url}{endpoint}", params=params, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True  # let urllib3 undo gzip before ijson reads
+            yield from ijson.items(response.raw, prefix, use_float=True)
 
     def get_teams(self) -> list[dict]:
         """Get all teams accessible to the authenticated user."""
@@ -111,23 +245,37 @@ class ClickUpClient:
         logging.info(f"Tasks found: {len(response['tasks'])}")
         return response['tasks']
 
+    def iter_all_tasks(self, list_id: str, **params):
+        """Yield tasks from a list page by page, prefetching the next page.
+
+        As soon as a full page arrives the following page is requested in the
+        background, so its network time overlaps with the caller's processing.
+        """
+        table_view = self.get_table_view(list_id) # returns DoNotAlter table
+        if table_view is None:
+            raise ValueError(f"No 'DoNotAlter' view found for list {list_id}")
+        view_id = table_view['id']
+
+        page = 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.get_view_tasks, view_id, {**params, 'page': page})
+            while future is not None:
+                tasks = future.result()
+                logging.info(f"Page: {page} (Tasks: {len(tasks)})")
+
+                if len(tasks) < 30:
+                    future = None  # Last page reached
+                else:
+                    page += 1
+                    future = executor.submit(self.get_view_tasks, view_id, {**params, 'page': page})
+                yield tasks
+
     def get_all_tasks(self, list_id: str, **params) -> list[dict]:
         """Get all tasks from a list, handling pagination."""
         all_tasks = []
-        page = 0
-
-        while True:
-            params['page'] = page
-            table_view = self.get_table_view(list_id) # returns DoNotAlter table
-            tasks = self.get_view_tasks(table_view['id'], params)
+        for tasks in self.iter_all_tasks(list_id, **params):
             all_tasks.extend(tasks)
 
-            logging.info(f"Page: {page} (Tasks: {len(tasks)})")
-
-            if len(tasks) < 30:
-                break  # Last page reached
-            page += 1
-
         logging.info(f"Total tasks retrieved from list {list_id}: {len(all_tasks)}")
         return all_tasks
 
@@ -144,6 +292,37 @@ class ClickUpClient:
         response = self._get(f'team/{team_id}/time_entries', params=params)
         return response['data']
 
+    def get_team_time_entries(self, team_id: str, task_ids=None, start=None, end=None,
+                              assignees=None, chunk_size: int = 100) -> list[dict]:
+        """Get team time entries for many tasks in a few requests.
+
+        Task IDs are sent as a repeated ``task_id`` query parameter,
+        ``chunk_size`` at a time to stay under URL length limits, and each
+        chunk is paged like fetch_clickup_data. Without
+        ``start``/``end`` ClickUp only returns the last 30 days, and without
+        ``assignees`` only the authenticated user's entries.
+        """
+        params = {}
+        if start is not None:
+            params['start_date'] = start
+        if end is not None:
+            params['end_date'] = end
+        if assignees:
+            params['assignee'] = assignees
+
+        def fetch_chunk(chunk_params):
+            return self._fetch_pages(
+                lambda page: self.get_team_time_tracking(team_id, **chunk_params, page=page), batch_size=4
+            )
+
+        if not task_ids:
+            return fetch_chunk(params)
+
+        entries = []
+        for i in range(0, len(task_ids), chunk_size):
+            entries.extend(fetch_chunk({**params, 'task_id': task_ids[i:i + chunk_size]}))
+        return entries
+
     def get_required_views(self, list_id):
         """
         Retrieve specific ClickUp view.
@@ -151,26 +330,16 @@ class ClickUpClient:
         :param view_id: The ID of the ClickUp view.
         :return: A list of tasks in the specified view.
         """
-        url = f'{self.base_url}list/{list_id}/view'
-        response = requests.get(url, headers=self.headers)
-        if response.status_code == 200:
-            return response.json().get('required_views', [])
-        else:
-            response.raise_for_status()
+        return self._get(f'list/{list_id}/view').get('required_views', [])
 
-    def get_views(self, view_id):
+    def get_views(self, list_id):
         """
-        Retrieve specific ClickUp view.
+        Retrieve the views available for a ClickUp list.
 
-        :param view_id: The ID of the ClickUp view.
-        :return: A list of tasks in the specified view.
+        :param list_id: The ID of the ClickUp list.
+        :return: A list of view dictionaries for the list.
         """
-        url = f'{self.base_url}list/{list_id}/view'
-        response = requests.get(url, headers=self.headers)
-        if response.status_code == 200:
-            return response.json().get('views', [])
-        else:
-            response.raise_for_status()
+        return self._get(f'list/{list_id}/view').get('views', [])
 
     def get_list_view(self, list_id):
         """
@@ -190,11 +359,11 @@ class ClickUpClient:
         :param list_id: The ID of the ClickUp list.
         :return: The 'DoNotAlter' table view dictionary.
         """
-        views = self.get_views(list_id)  # Assuming get_views is defined and returns the list of views
-        for view in views:
-            if view['name'] == 'DoNotAlter':  # Find the view by name
-                return view  # Return the view dictionary
-        return None  # Return None if 'DoNotAlter' view is not found
+        # Memoized per list for the lifetime of the client
+        if list_id not in self._table_view_cache:
+            views_by_name = {view['name']: view for view in self.get_views(list_id)}
+            self._table_view_cache[list_id] = views_by_name.get('DoNotAlter')  # None if not found
+        return self._table_view_cache[list_id]
 
     def get_view_tasks(self, view_id, params: dict):
         """
@@ -205,10 +374,101 @@ class ClickUpClient:
         :param view_id: The ID of the ClickUp view.
         :return: A list of tasks in the specified view.
         """
-        url = f'{self.base_url}/view/{view_id}/task'
-        response = requests.get(url, headers=self.headers, params=params)
-        if response.status_code == 200:
-            return response.json().get('tasks', [])
-        else:
-            response.raise_for_status()
-
+        return self._get(f'view/{view_id}/task', params=params).get('tasks', [])
+
+
+# Define methods to extract custom fields
+def extract_custom_fields(tasks):
+    """Pivots every task's custom field values into one column per field.
+
+    :param: tasks: A list of tasks retrieved from the ClickUp API.
+    :return: A DataFrame indexed by task id with a column per custom field name,
+        ready to merge onto a task frame with ``merge(..., left_on='id', right_index=True)``. """
+
+    tasks_with_cf = [task for task in tasks if task.get('custom_fields')]
+    if not tasks_with_cf:
+        return pd.DataFrame(index=pd.Index([], name='id'))
+
+    # Custom fields carry their own 'id', so the task id gets a prefix; max_level=0
+    # keeps dict values (e.g. locations) and type_config as single cells
+    cf = pd.json_normalize(tasks_with_cf, record_path='custom_fields', meta=['id'], meta_prefix='task_', max_level=0)
+    if 'value' not in cf:
+        cf['value'] = None
+
+    cf_wide = cf.pivot_table(index='task_id', columns='name', values='value', aggfunc='first', dropna=False)
+    return cf_wide.rename_axis(index='id', columns=None)
+
+# Define methods for time tracking processing
+def extract_tracked_time(client, tasks, team_id, assignees, start, end):
+    """Fetch time tracking entries for the given tasks and flatten them.
+
+    Entries are pulled through the team-level time entries endpoint in a
+    few chunked requests rather than one request per task.
+
+    Args:
+        client (ClickUpClient): Client used for the requests.
+        tasks (list[dict]): Tasks retrieved from the ClickUp API.
+        team_id (str): The ID of the ClickUp team owning the tasks.
+        assignees (str): Comma-separated user IDs to include; ClickUp returns
+            only the caller's own entries without them.
+        start (int): Range start as a Unix timestamp in milliseconds.
+        end (int): Range end as a Unix timestamp in milliseconds; ClickUp
+            defaults to the last 30 days without a range.
+
+    Returns:
+        pd.DataFrame: One row per tracked time interval, ordered by task.
+    """
+    task_ids = [task['id'] for task in tasks]
+    entries = client.get_team_time_entries(team_id, task_ids=task_ids, start=start, end=end, assignees=assignees)
+
+    # Collect plain column lists; timestamps and durations are converted in bulk below
+    task_id_col, assignees_col, starts, ends, durations_ms, tags = [], [], [], [], [], []
+    for entry in entries:
+        task_id_col.append((entry.get('task') or {}).get('id'))
+        assignees_col.append((entry.get('user') or {}).get('username', 'Unknown'))
+        starts.append(entry.get('start'))
+        ends.append(entry.get('end'))
+        durations_ms.append(entry.get('duration', 0))
+        tags.append(', '.join(tag['name'] for tag in entry.get('tags') or []))
+
+    start_ms = pd.to_numeric(pd.Series(starts, dtype=object), errors='coerce')
+    end_ms = pd.to_numeric(pd.Series(ends, dtype=object), errors='coerce')
+    duration_ms = pd.to_numeric(pd.Series(durations_ms, dtype=object), errors='coerce').fillna(0)
+
+    df_time_tracked = pd.DataFrame({
+        'Task ID': task_id_col,
+        'Data Team Assignee': assignees_col,
+        'Time Tracked (Duration) [hours]': (duration_ms / 3.6e6).round(2),
+        'Time Tracked (Start)': pd.to_datetime(start_ms, unit='ms').dt.strftime('%Y-%m-%d %H:%M'),
+        'Time Tracked (End)': pd.to_datetime(end_ms, unit='ms').dt.strftime('%Y-%m-%d %H:%M'),
+        'Tag Names': tags
+    })
+
+    # Keep only the requested tasks, grouped in the order they were given
+    df_time_tracked['Task ID'] = pd.Categorical(df_time_tracked['Task ID'], categories=list(dict.fromkeys(task_ids)))
+    df_time_tracked = df_time_tracked.dropna(subset=['Task ID']).sort_values('Task ID', kind='stable')
+    df_time_tracked['Task ID'] = df_time_tracked['Task ID'].astype(str)
+    return df_time_tracked.reset_index(drop=True)
+
+# Create dropdown index to name maps for table labelling
+def extract_dropdown_maps(tasks, names=('Client', 'Root cause')):
+    """Creates option-to-name mappings for dropdown custom fields in one pass.
+
+    :param: tasks: A list of tasks retrieved from the ClickUp API.
+    :param: names: Names of the dropdown custom fields to map.
+    :return: A dictionary {field_name: {orderindex: option_name}}. """
+
+    # Get custom fields from the first task
+    custom_fields = tasks[0].get('custom_fields', []) if tasks else []
+
+    dropdown_maps = {name: {} for name in names}
+    for field in custom_fields:
+        field_name = field.get('name')
+        if field_name in dropdown_maps:
+            options = field.get('type_config', {}).get('options', [])
+            # A task's dropdown value is the option's orderindex, not its list position
+            dropdown_maps[field_name] = {
+                option.get('orderindex', idx): option.get('name') for idx, option in enumerate(options)
+            }
+
+    return dropdown_maps
@@ -3,6 +3,7 @@ import datetime
 import time
 
 import requests
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from datetime import datetime, timezone
@@ -10,6 +11,19 @@ from clickup_client import ClickUpClient
 import clickup_client
 import streamlit as st
 
+# ----------------------- Cached ClickUp access (survives Streamlit reruns) -----------------------
+@st.cache_resource
+def make_client(token):
+    return ClickUpClient(api_token=token)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_team(token):
+    return make_client(token).get_team()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_entries(token, start, end, team_id, assignees):
+    return make_client(token).fetch_time_entry_columns(start, end, team_id, assignees)
+
 # streamlit page header
 st.title("ClickUp Time Tracking by Tag")
 
@@ -18,12 +32,10 @@ st.sidebar.header("Configuration")
 
 user_token = st.sidebar.text_input("ClickUp API Token")
 team = 'x'
-client = 'x'
 
 if user_token:
-    client = ClickUpClient(api_token=user_token)
     # Get 'MMS' team id (only team)
-    team = client.get_team()
+    team = load_team(user_token)
 else:
     st.error("Invalid ClickUp API Token")
 
@@ -54,21 +66,27 @@ START_DATE = int(datetime.combine(start_date, datetime.min.time()).replace(tzinf
 END_DATE = int(datetime.combine(end_date, datetime.max.time()).replace(tzinfo=timezone.utc).timestamp() * 1000)
 
 # ------------------------- Get ClickUp Data for Time Tracking ----------------------------------
-data = client.fetch_clickup_data(START_DATE, END_DATE, team_id, assignees)
-
-if data:
-    df = pd.DataFrame(data)
-    # Clean timestamps
-    df["start"] = pd.to_numeric(df["start"], errors="coerce")
-    df["end"] = pd.to_numeric(df["end"], errors="coerce")
+entries = load_entries(user_token, START_DATE, END_DATE, team_id, assignees)
+
+if entries["id"]:
+    # Build typed columns up front instead of letting pandas infer object columns and re-casting them;
+    # ClickUp sends ms timestamps as strings and omits "end" on running timers (-> NaN)
+    n_entries = len(entries["id"])
+    df = pd.DataFrame({
+        "id": pd.Categorical(entries["id"]),
+        "start": np.fromiter((float(v or "nan") for v in entries["start"]), dtype=np.float64, count=n_entries),
+        "end": np.fromiter((float(v or "nan") for v in entries["end"]), dtype=np.float64, count=n_entries),
+        "duration": np.fromiter((float(v or "nan") for v in entries["duration"]), dtype=np.float64, count=n_entries),
+        "billable": np.array(entries["billable"], dtype=bool),
+    })
     df["StartDate"] = pd.to_datetime(df["start"], unit="ms", utc=True)
     df["EndDate"] = pd.to_datetime(df["end"], unit="ms", utc=True)
 
     # Duration and Labels
-    df["Duration (hours)"] = pd.to_numeric(df["duration"], errors="coerce") / (1000 * 60 * 60)
-    df["Billable"] = df["billable"].apply(lambda x: "Billable" if x else "Non-Billable")
-    df["UserName"] = df["user"].apply(lambda x: x["username"] if isinstance(x, dict) else None)
-    df["TagName"] = df["tags"].apply(lambda tags: [tag["name"].lower() for tag in tags] if isinstance(tags, list) else [])
+    df["Duration (hours)"] = df["duration"] / (1000 * 60 * 60)
+    df["Billable"] = pd.Categorical(np.where(df["billable"], "Billable", "Non-Billable"))
+    df["UserName"] = pd.Categorical(entries["username"])
+    df["TagName"] = [[name.lower() for name in names] for names in entries["tags"]]
 
 # -------------------------- Specify & Search by Tags ----------------------------------------
 #tag_input = input("Enter tags to filter by (separated by commas): ")
@@ -76,23 +94,22 @@ tag_input = st.text_input("Tags (comma-separated)")
 search_tags = [tag.strip() for tag in tag_input.split(",") if tag.strip()]
 
 # ----------------------- Get Time Tracking Analysis by Tags ----------------------------------------
-# Filter entries with specified tags
-acid_df = df[df["tags"].apply(
-    lambda tags: any(tag["name"] in search_tags for tag in tags) if isinstance(tags, list) else False
-)].copy()
-
-# Explode for tag-level analysis
-acid_exploded = acid_df.explode("TagName")
-acid_exploded = acid_exploded[acid_exploded["TagName"].isin(search_tags)]
-
-# Group by tag and billable status
-tag_summary = acid_exploded.groupby(["TagName", "Billable"])["Duration (hours)"].sum().unstack(fill_value=0)
+# Explode the lowercased tag lists once and keep only the searched tags
+search_set = {tag.lower() for tag in search_tags}
+exploded = df[["id", "Duration (hours)", "Billable", "TagName"]].explode("TagName")
+exploded["TagName"] = exploded["TagName"].astype("category")
+tag_hits = exploded[exploded["TagName"].isin(search_set)]
+
+# Group by tag and billable status (on category codes; plain labels afterwards so Total can be added)
+tag_summary = tag_hits.groupby(["TagName", "Billable"], observed=True)["Duration (hours)"].sum().unstack(fill_value=0)
+tag_summary.index = tag_summary.index.astype(str)
+tag_summary.columns = tag_summary.columns.astype(str)
 tag_summary["Total Hours"] = tag_summary.sum(axis=1)
 tag_summary["% Billable"] = (tag_summary["Billable"] / tag_summary["Total Hours"]) * 100
 tag_summary = tag_summary.round(2)
 
 # Deduplicated total row
-dedup_total = acid_df.drop_duplicates(subset="id").copy()
+dedup_total = df[df["id"].isin(tag_hits["id"].unique())].drop_duplicates(subset="id").copy()
 total_row = {
     "Billable": dedup_total[dedup_total["Billable"] == "Billable"]["Duration (hours)"].sum(),
     "Non-Billable": dedup_total[dedup_total["Billable"] == "Non-Billable"]["Duration (hours)"].sum()